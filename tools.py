@@ -1,18 +1,19 @@
+import os
 import pandas as pd
 import numpy as np
 from collections import defaultdict
 
-from sklearn.preprocessing import scale
 from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from sklearn.mixture import GaussianMixture, BayesianGaussianMixture
+from sklearn.impute import KNNImputer
 from sklearn import metrics
+from joblib import Parallel, delayed
 import hdbscan
 
 from scipy.cluster import hierarchy
-from fastcluster import linkage
-
-from fancyimpute import KNN
+from scipy.spatial.distance import pdist
+from fastcluster import linkage, linkage_vector
 
 import matplotlib.pyplot as plt
 
@@ -68,25 +69,40 @@ class Preprocessing:
         Drop the rows/columns of self.df with more than p (%) missing values
         axis -- indicate whether to drop rows (axis=0) or columns(axis=1)
         '''
-        # create df with the count of missing values for each row/column
-        missing_df = pd.DataFrame(self.df.isnull().sum(axis=int(not axis)))
+        # count the missing values of each row/column from the null mask
+        other_axis = int(not axis)
+        missing = self.df.isnull().to_numpy().sum(axis=other_axis)
         # extract the names of rows/columns with more than p (%) missing values
+        poor = missing > p*self.df.shape[other_axis]
+        poor_features = self.df.axes[axis][poor]
+        # drop sparse rows/columns
         if axis == 0:
-            length = len(self.df.columns)
+            self.df = self.df.iloc[~poor]
         else:
-            length = len(self.df)
-        poor_features = missing_df.loc[missing_df[0] > p*length].index
-        # drop sparse rows/columns
-        self.df.drop(poor_features, axis=axis, inplace=True)
+            self.df = self.df.iloc[:, ~poor]
         return self.df, poor_features
 
-    def imputeKNN(self):
-        # df is my data frame with the missings. I keep only floats
-        self.country_names = self.df['Country Name'].values
-        df_numeric = self.df.select_dtypes(include=[np.float64]).values
+    def imputeKNN(self, n_neighbors=2, colmax=0.8):
+        '''
+        Impute the missing values from the n_neighbors nearest countries.
+        Features with more than colmax (%) missing values are left out
+        of the neighbours search and filled with their mean instead.
+        '''
+        # df is my data frame with the missings: all columns but
+        # Country Names have already been converted to numeric type
+        self.country_names = self.df['Country Name'].to_numpy(dtype=object)
+        df_numeric = self.df.iloc[:, 1:].astype(np.float64, copy=False)
+        empty = df_numeric.columns[df_numeric.isnull().all().to_numpy()]
+        if len(empty):
+            raise ValueError('No value to impute from in features %s: '
+                             'drop them first (see dropPoorFeatures)'
+                             % list(empty))
+        sparse = df_numeric.isnull().mean().to_numpy() > colmax
         # impute missing values
-        df_filled_KNN = pd.DataFrame(
-            KNN(k=2, verbose=False).complete(df_numeric))
+        imputer = KNNImputer(n_neighbors=n_neighbors, weights='distance')
+        df_filled_KNN = df_numeric.fillna(df_numeric.mean())
+        df_filled_KNN.iloc[:, ~sparse] = \
+            imputer.fit_transform(df_numeric.iloc[:, ~sparse])
         df_filled_KNN.insert(
             loc=0, column='Country Names', value=self.country_names)
         df_filled_KNN.columns = self.df.columns
@@ -103,15 +119,61 @@ class Preprocessing:
             self.df_filled_KNN.to_csv(path)
 
 
-def heatmap(df, links):
+def plotHeatmap(data, links, labels, columns='auto'):
     '''
-    Plot a matrix dataset as a hierarchically-clustered heatmap,
-    using given linkages.
+    Plot a matrix dataset as a heatmap, with its rows ordered
+    as the leaves of the given hierarchical linkages.
+    labels -- the names of the rows (countries)
+    columns -- the names of the columns (features)
     '''
+    # reversed, to read top-down as a dendrogram drawn with
+    # orientation='right'
+    order = hierarchy.leaves_list(links)[::-1]
     cmap = sns.cubehelix_palette(
         as_cmap=True, start=.5, rot=-.75, light=.9)
-    sns.clustermap(
-        data=df, row_linkage=links, col_cluster=False, cmap=cmap)
+    plt.figure(figsize=(9, 12))
+    sns.heatmap(data[order], cmap=cmap,
+                xticklabels=columns, yticklabels=labels[order])
+
+
+def eighPCA(pca, X):
+    '''
+    Fit the given (unfitted) sklearn PCA through the eigendecomposition
+    of the d x d covariance matrix of X, which is much cheaper than the SVD
+    of X when the number of features d is small compared to the samples.
+    '''
+    # same check as PCA.fit: eigh fails obscurely on non-finite data
+    if not np.isfinite(X).all():
+        raise ValueError('Input contains NaN or infinity: impute or drop '
+                         'the missing values before computing the PC')
+    n_samples, n_features = X.shape
+    # the d x d problem is small: solve it in double precision
+    X = X.astype(np.float64)
+    mean = X.mean(axis=0)
+    X -= mean
+    # eigenvalues are returned in ascending order: reverse them
+    eigvals, eigvecs = np.linalg.eigh(np.dot(X.T, X))
+    eigvals = np.clip(eigvals[::-1], 0, None)
+    eigvecs = eigvecs[:, ::-1][:, :pca.n_components]
+    # deterministic signs: the largest loading of each PC is positive
+    max_rows = np.abs(eigvecs).argmax(axis=0)
+    eigvecs *= np.sign(eigvecs[max_rows, range(eigvecs.shape[1])])
+    # store the same fitted attributes as PCA.fit
+    pca.mean_ = mean
+    pca.components_ = eigvecs.T
+    pca.n_components_ = pca.n_components
+    pca.explained_variance_ = eigvals[:pca.n_components] / (n_samples - 1)
+    pca.explained_variance_ratio_ = \
+        eigvals[:pca.n_components] / eigvals.sum()
+    pca.singular_values_ = np.sqrt(eigvals[:pca.n_components])
+    pca.n_samples_, pca.n_features_in_ = n_samples, n_features
+    # average variance of the discarded components
+    if pca.n_components < min(n_samples, n_features):
+        pca.noise_variance_ = \
+            eigvals[pca.n_components:].mean() / (n_samples - 1)
+    else:
+        pca.noise_variance_ = 0.
+    return pca
 
 
 class Clustering:
@@ -121,14 +183,20 @@ class Clustering:
         self.df = self.df.set_index('Country Code', verify_integrity=True)
         # df.info(verbose=False)
         # store country full names (for plots) before removing the feature
-        self.country_names = self.df['Country Name'].values
+        self.country_names = self.df['Country Name'].to_numpy(dtype=object)
         self.df = self.df.drop(['Country Name'], axis=1)
-        # scale the dataset to be distributed as a standard Gaussian
-        cols = self.df.columns
-        ind = self.df.index
-        self.df = pd.DataFrame(scale(self.df))
-        self.df.columns = cols
-        self.df.index = ind
+        # scale the dataset to be distributed as a standard Gaussian, in place
+        # on a contiguous float32 array, which is what the clustering methods
+        # are fed with
+        X = np.array(self.df.to_numpy(), dtype=np.float32, order='C')
+        # missing values are ignored in the statistics and kept as NaN
+        X -= np.nanmean(X, axis=0)
+        std = np.nanstd(X, axis=0)
+        # leave constant features untouched, as sklearn's scale does
+        std[std == 0] = 1
+        X /= std
+        self.X = X
+        self.df = pd.DataFrame(X, index=self.df.index, columns=self.df.columns)
         # create disctionary of clusters
         self.clusterings = defaultdict(lambda: np.array(0))
         self.clusterings_labels = defaultdict(lambda: np.array(0))
@@ -137,16 +205,29 @@ class Clustering:
             print('The imported dataset as the following characteristics:')
             print(self.df.info(verbose=False))
 
-    def getPC(self):
+    def getPC(self, n_components=10):
         '''
-        Calculate the principal components (PC) and create a new DataFrame
-        by projecting the datapoints on the PC space.
+        Calculate the first n_components principal components (PC).
+        The projections of the datapoints on the PC space are computed
+        on demand, from the PC loadings (see df_pc).
         '''
-        self.pca = PCA()
+        # the number of PC is bounded by the shape of the dataset
+        n_samples, n_features = self.df.shape
+        n_components = min(n_components, n_samples, n_features)
+        if n_features <= 0.5 * n_samples:
+            # few features: eigendecompose the small covariance matrix
+            self.pca = eighPCA(PCA(n_components=n_components), self.X)
+        else:
+            # otherwise, randomized truncated SVD
+            self.pca = PCA(n_components=n_components,
+                           svd_solver='randomized', random_state=42)
+            self.pca.fit(self.X)
+        # keep what is needed to project the datapoints on the PC:
+        # the loadings and the projection of the mean (length k offset)
+        self._V = self.pca.components_.astype(np.float32)
+        self._mean_pc = np.dot(self.pca.mean_, self._V.T).astype(np.float32)
         self.pca_loadings = pd.DataFrame(
-            PCA().fit(self.df).components_.T, index=self.df.columns)
-        self.df_pc = pd.DataFrame(
-            self.pca.fit_transform(self.df), index=self.df.index)
+            self.pca.components_.T, index=self.df.columns)
 
         # plot the cumulated proportion of variance explained by the PC
         print('CUMULATIVE PROPORTION OF VARIANCE EXPLAINED BY PCs')
@@ -161,11 +242,37 @@ class Clustering:
 
         plt.ylabel('Proportion of Variance Explained')
         plt.xlabel('Principal Component')
-        plt.xlim(0.75, 4.25)
+        plt.xlim(0.75, min(n_components, 4) + 0.25)
         plt.ylim(0, 1.05)
         plt.xticks(range(1, len(self.pca.components_)+1))
         plt.legend(loc=2)
 
+    @property
+    def df_pc(self):
+        '''DataFrame of the projections of the datapoints on all the PC'''
+        return pd.DataFrame(
+            self._project(len(self._V) - 1), index=self.df.index)
+
+    def _project(self, on_PC):
+        '''
+        Return the projections of the datapoints on the first on_PC+1
+        principal components, as a float32 array.
+        '''
+        if on_PC >= len(self._V):
+            raise ValueError(
+                'Only %i PC were computed: call getPC(n_components=%i) '
+                'to use PC %i' % (len(self._V), on_PC+1, on_PC))
+        return np.dot(self.X, self._V[:on_PC+1].T) - self._mean_pc[:on_PC+1]
+
+    def _select(self, on_PC):
+        '''
+        Return the data to cluster: the projections on the first on_PC+1
+        principal components if on_PC > 0, the scaled dataset otherwise.
+        '''
+        if on_PC > 0:
+            return self._project(on_PC)
+        return self.X
+
     def plotAlongPC(self, pc1=0, pc2=1, xlim=[-5, 5], ylim=[-5, 5],
                     loadings=True, clustering=None):
         '''
@@ -177,28 +284,25 @@ class Clustering:
         ax1.set_xlim(xlim[0], xlim[1])
         ax1.set_ylim(ylim[0], ylim[1])
 
+        # extract the coordinates once (the second PC is plotted flipped)
+        X_pc = self._project(max(pc1, pc2))
+        xs = X_pc[:, pc1]
+        ys = -X_pc[:, pc2]
+        countries = self.df.index.to_numpy()
         if clustering is not None:
             # build a generator of colors
             NUM_COLORS = len(self.clusterings[clustering])
             clist = np.random.uniform(low=0, high=1, size=(NUM_COLORS, 4))
-            # plot countries along PCs coloring them according to their cluster
-            labels = self.clusterings_labels[clustering]
-            for i, country in enumerate(self.df_pc.index):
-                ax1.annotate(country,
-                             (self.df_pc[pc1].loc[country],
-                              -self.df_pc[pc2].loc[country]),
-                             ha='center',
-                             color=clist[labels[i]],
-                             fontweight='bold')
+            # color countries according to their cluster
+            colors = clist[self.clusterings_labels[clustering]]
         else:
-            # plot countries along PCs
-            for i in self.df_pc.index:
-                ax1.annotate(i,
-                             (self.df_pc[pc1].loc[i],
-                              -self.df_pc[pc2].loc[i]),
-                             ha='center',
-                             color='b',
-                             fontweight='bold')
+            colors = ['b'] * len(countries)
+        # plot countries along PCs
+        for country, x, y, color in zip(countries, xs, ys, colors):
+            ax1.annotate(country, (x, y),
+                         ha='center',
+                         color=color,
+                         fontweight='bold')
 
         # Plot reference lines
         ax1.hlines(0, -5, 5, linestyles='dotted', colors='grey')
@@ -218,20 +322,15 @@ class Clustering:
             # ax2.set_xlabel('Principal Component loading vectors',
             # color='orange')
 
-            # Plot labels for vectors.
+            # Plot vectors and their labels, one for each feature.
             # 'a' is an offset parameter to separate arrow tip and text.
             a = 1.07
-            for i in self.pca_loadings[[pc1, pc2]].index:
-                ax2.annotate(i,
-                             (self.pca_loadings[pc1].loc[i]*a,
-                              -self.pca_loadings[pc2].loc[i]*a),
-                             color='orange')
-
-            # Plot vectors
-            for k in range(len(self.pca_loadings.columns)):
-                ax2.arrow(0, 0, self.pca_loadings[pc1][k],
-                          -self.pca_loadings[pc2][k],
-                          width=0.002, color='black')
+            load_xs = self.pca_loadings[pc1].to_numpy()
+            load_ys = -self.pca_loadings[pc2].to_numpy()
+            for feature, x, y in zip(self.pca_loadings.index,
+                                     load_xs, load_ys):
+                ax2.annotate(feature, (x*a, y*a), color='orange')
+                ax2.arrow(0, 0, x, y, width=0.002, color='black')
         return
 
     def plotDendrogram(self, links, threshold, metric, method):
@@ -253,13 +352,10 @@ class Clustering:
         '''
         Clustering is an array of cluster labels, one for each country
         '''
-        lis = sorted(
-            list(zip(clustering, self.country_names)), key=lambda x: x[0])
-        groups = set(map(lambda x: x[0], lis))
-        table = pd.DataFrame(list(
-            zip(groups, [[y[1] for y in lis if y[0] == x] for x in groups])))
-        table.columns = ['Cluster', '']
-        table.set_index('Cluster', inplace=True, verify_integrity=False)
+        # group the country names by cluster label in a single pass
+        groups = pd.Series(self.country_names).groupby(clustering).apply(list)
+        table = groups.to_frame('')
+        table.index.name = 'Cluster'
         return table
 
     def saveClustering(self, cluster_labels, clustering_name):
@@ -283,11 +379,10 @@ class Clustering:
                      in the hierachical tree.
         on_PC -- [int] apply clustering by using data projections
                  on the first on_PC principal components
+        heatmap -- [bool] also plot the data as a heatmap ordered
+                   by the clustering, for each method
         '''
-        if on_PC > 0:
-            df = self.df_pc.iloc[:, :on_PC+1]
-        else:
-            df = self.df
+        df = self._select(on_PC)
 
         if method == 'all':
             method = ['average',
@@ -302,59 +397,78 @@ class Clustering:
             method = list([method])
         metric = str(metric)
 
-        for met in method:
+        # ward, centroid and median linkages need Euclidean distances
+        met_metrics = [
+            'euclidean' if met in ['centroid', 'median', 'ward'] else metric
+            for met in method]
+        vector_methods = ['single', 'centroid', 'median', 'ward']
+        # condensed distance matrices, computed once for all the methods
+        distances = {}
+        for met, met_metric in zip(method, met_metrics):
+            if met_metric == 'euclidean' and met in vector_methods:
+                continue
+            if met_metric not in distances:
+                distances[met_metric] = pdist(df, metric=met_metric)
+
+        def link(met, met_metric):
             # set up the linking tool
-            links = linkage(df, metric=metric, method=met)
+            if met_metric == 'euclidean' and met in vector_methods:
+                # O(n) memory algorithms, working on the data points
+                return linkage_vector(df, method=met, metric=met_metric)
+            return linkage(distances[met_metric], method=met)
+
+        # fastcluster releases the GIL: link the methods in parallel threads
+        n_jobs = max(1, min(len(method), os.cpu_count() or 1))
+        all_links = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(link)(met, met_metric)
+            for met, met_metric in zip(method, met_metrics))
+
+        for met, met_metric, links in zip(method, met_metrics, all_links):
             self.link = links
             # plot dendrogram
-            self.plotDendrogram(links, threshold, metric, met)
+            self.plotDendrogram(links, threshold, met_metric, met)
             if heatmap:
-                heatmap(df, links)
+                # PC projections are just labelled by their index
+                columns = self.df.columns if on_PC == 0 else 'auto'
+                plotHeatmap(df, links, self.country_names, columns)
 
             labels = hierarchy.fcluster(links, threshold, criterion='distance')
             # save clusters
             self.saveClustering(
-                labels, 'hc_'+str(met)+'_'+str(metric)+'_'+str(threshold))
+                labels, 'hc_'+str(met)+'_'+met_metric+'_'+str(threshold))
 
         # self.hierarchical_classes = get_hierarchical_classes(den)
         # plt.savefig('tree2.png')
 
     def hdbscan(self, min_cluster_size=2, on_PC=0):
         '''compute clusters using HDBSCAN algorithm'''
-        if on_PC > 0:
-            df = self.df_pc.iloc[:, :on_PC+1]
-        else:
-            df = self.df
+        df = self._select(on_PC)
         clusterer = hdbscan.HDBSCAN(min_cluster_size=min_cluster_size)
         clusterer.fit_predict(df)
         # save clusters
         self.saveClustering(clusterer.labels_, 'hdbscan')
 
     def bayesianGaussianMixture(self, n_components, covariance_type='full',
-                                n_init=50, on_PC=0):
+                                n_init=3, on_PC=0):
         '''
         Compute Bayesian Gaussian Mixture clustering.
         Note: in this case, the number of components effectively used
         can be < n_componentss (at most, n_components).
         '''
-        if on_PC > 0:
-            df = self.df_pc.iloc[:, :on_PC+1]
-        else:
-            df = self.df
+        df = self._select(on_PC)
         clusterer = BayesianGaussianMixture(n_components,
                                             covariance_type=covariance_type,
-                                            n_init=n_init)
+                                            n_init=n_init,
+                                            init_params='kmeans',
+                                            random_state=42)
         labels = clusterer.fit(df).predict(df)
         # save clusters
         self.saveClustering(labels, 'bayesian gm' + str(n_components))
 
     def gaussianMixture(self, n_components, covariance_type='full',
-                        n_init=50, on_PC=0):
+                        n_init=10, on_PC=0):
         '''compute Gaussian Mixture clustering'''
-        if on_PC > 0:
-            df = self.df_pc.iloc[:, :on_PC+1]
-        else:
-            df = self.df
+        df = self._select(on_PC)
         clusterer = GaussianMixture(n_components,
                                     covariance_type=covariance_type,
                                     n_init=n_init)
@@ -363,17 +477,17 @@ class Clustering:
         self.saveClustering(labels, 'gm' + str(n_components))
 
     def gmBIC(self, n_min, n_max, covariance_type='full',
-              n_init=50, on_PC=0):
-        if on_PC > 0:
-            df = self.df_pc.iloc[:, :on_PC+1]
-        else:
-            df = self.df
-        '''compute Bayesian Information Criterion'''
+              n_init=3, on_PC=0, n_jobs=-1):
+        '''
+        compute Bayesian Information Criterion
+        n_jobs -- [int] number of models fitted in parallel (-1: all CPUs)
+        '''
+        df = self._select(on_PC)
         n_components = np.arange(n_min, n_max)
-        models = [
-            GaussianMixture(n, covariance_type=covariance_type, n_init=n_init)
-            for n in n_components]
-        bics = [model.fit(df).bic(df) for model in models]
+        # the models are independent: fit them in parallel
+        bics = Parallel(n_jobs=n_jobs)(
+            delayed(gaussianMixtureBIC)(df, n, covariance_type, n_init)
+            for n in n_components)
         bics = np.array(bics)
         # store the optimal number of gaussian components and the resulting BIC
         self.min_BIC = [bics.argmin()+n_min, bics.min()]
@@ -382,15 +496,13 @@ class Clustering:
         fig, ax = plt.subplots(num='Bayesian Information Criterion')
         plt.plot(n_components, bics)
 
-    def kmeans(self, n_clusters=2, on_PC=0, n_init=50, evaluate=True):
+    def kmeans(self, n_clusters=2, on_PC=0, n_init=10, evaluate=True):
         '''compute clusters using KMeans algorithm'''
-        if on_PC > 0:
-            df = self.df_pc.iloc[:, :on_PC+1]
-        else:
-            df = self.df
+        df = self._select(on_PC)
         # re-initialize seed for random initial centroids' position
         np.random.seed(42)
-        clusterer = KMeans(n_clusters=n_clusters, n_init=n_init)
+        clusterer = KMeans(n_clusters=n_clusters, n_init=n_init,
+                           algorithm='elkan')
         clusterer.fit_predict(df)
         # save clusters
         self.saveClustering(clusterer.labels_, 'kmeans' + str(n_clusters))
@@ -398,23 +510,41 @@ class Clustering:
         if evaluate:
             benchClustering(clusterer, 'kmeans', df)
 
-    def multipleKmeans(self, k_min, k_max, on_PC=0, n_init=50):
-        if on_PC > 0:
-            df = self.df_pc.iloc[:, :on_PC+1]
-        else:
-            df = self.df
+    def multipleKmeans(self, k_min, k_max, on_PC=0, n_init=10):
+        '''
+        Score KMeans clusterings for k in [k_min, k_max).
+        n_init -- [int] k-means++ restarts at k_min. Each following k is
+                  warm-started from the (k-1)-means solution and only gets
+                  max(1, n_init // 10) extra k-means++ restarts: the best
+                  of these runs is kept, so the sweep is much cheaper but
+                  its inertia can be slightly worse than a full restart.
+        '''
+        df = self._select(on_PC)
 
         ks = np.arange(k_min, k_max)
         silh = np.zeros(k_max - k_min)
         cal_har = np.zeros(k_max - k_min)
+        # pairwise distances don't depend on k: compute them once
+        distances = metrics.pairwise_distances(df, metric='euclidean')
+        clusterer = None
         for k in ks:
             # re-initialize seed for random initial centroids' position
             np.random.seed(42)
-            clusterer = KMeans(n_clusters=k, n_init=n_init)
-            clusterer.fit_predict(df)
+            if clusterer is None:
+                clusterer = KMeans(n_clusters=k, n_init=n_init).fit(df)
+            else:
+                # warm start from the (k-1)-means solution, plus a few
+                # k-means++ restarts: keep the run with the lowest inertia
+                init = splitWorstCluster(
+                    df, clusterer.cluster_centers_, clusterer.labels_)
+                warm = KMeans(n_clusters=k, init=init, n_init=1).fit(df)
+                clusterer = KMeans(
+                    n_clusters=k, n_init=max(1, n_init // 10)).fit(df)
+                if warm.inertia_ < clusterer.inertia_:
+                    clusterer = warm
             silh[k-k_min] = metrics.silhouette_score(
-                df, clusterer.labels_, metric='euclidean')
-            cal_har[k-k_min] = metrics.calinski_harabaz_score(
+                distances, clusterer.labels_, metric='precomputed')
+            cal_har[k-k_min] = metrics.calinski_harabasz_score(
                 df, clusterer.labels_)
 
         # multiple line plot
@@ -548,10 +678,35 @@ def plotMultiBarh(df, by_columns, country_names):
     ax.legend()
 
 
+def splitWorstCluster(data, centers, labels, eps=0.5):
+    '''
+    Build k+1 initial centroids from a k-means solution, by splitting
+    the cluster with the highest inertia in two: its centroid is moved
+    by -/+ eps times the standard deviation of its points.
+    '''
+    sq_dist = ((data - centers[labels])**2).sum(axis=1)
+    inertia = np.bincount(labels, weights=sq_dist, minlength=len(centers))
+    worst = inertia.argmax()
+    delta = eps * data[labels == worst].std(axis=0)
+    new_centers = np.vstack([centers, centers[worst] + delta])
+    new_centers[worst] -= delta
+    return new_centers
+
+
+def gaussianMixtureBIC(data, n_components, covariance_type, n_init):
+    '''
+    Fit a k-means initialized Gaussian Mixture on data and return its BIC
+    '''
+    model = GaussianMixture(n_components, covariance_type=covariance_type,
+                            n_init=n_init, init_params='kmeans',
+                            random_state=42)
+    return model.fit(data).bic(data)
+
+
 def benchClustering(estimator, name, data):
     silh = metrics.silhouette_score(
         data, estimator.labels_, metric='euclidean')
-    cal_har = metrics.calinski_harabaz_score(data, estimator.labels_)
+    cal_har = metrics.calinski_harabasz_score(data, estimator.labels_)
     return silh, cal_har
 
 